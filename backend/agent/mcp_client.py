@@ -2,11 +2,15 @@
 import asyncio
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from common.rate_limit import parse_wait_event
+
+EventCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
 
 # Server definitions: (prefix, script_path)
 SERVERS = [
@@ -93,8 +97,19 @@ class MCPManager:
         """Return list of all discovered MCP tool metadata."""
         return self._tools_list
 
-    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
-        """Route a tool call to the correct server and return the result as a string."""
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        on_event: Optional[EventCallback] = None,
+    ) -> str:
+        """Route a tool call to the correct server and return the result as a string.
+
+        Args:
+            tool_name: Exposed tool name.
+            arguments: Tool arguments.
+            on_event: Receives `rate_limit` events reported by the server during the call.
+        """
         if tool_name not in self._tool_to_server:
             raise ValueError(f"Unknown tool: {tool_name}")
 
@@ -102,7 +117,32 @@ class MCPManager:
         real_name = self._tool_to_real[tool_name]
         session = self._sessions[prefix]
 
-        result = await session.call_tool(real_name, arguments=arguments)
+        # Rate-limit waits arrive as progress notifications for this call only
+        pending: set[asyncio.Task] = set()
+
+        def _forwarded(task: asyncio.Task):
+            pending.discard(task)
+            if not task.cancelled():
+                task.exception()  # A closed client is handled by the orchestrator's own sends
+
+        async def on_progress(progress: float, total: Optional[float], message: Optional[str]):
+            event = parse_wait_event(message)
+            if event is None or on_event is None:
+                return
+            # This runs inside the session's receive loop, which every caller of the
+            # server shares; hand the event off instead of awaiting client I/O here
+            task = asyncio.create_task(on_event(event))
+            pending.add(task)
+            task.add_done_callback(_forwarded)
+
+        try:
+            result = await session.call_tool(
+                real_name, arguments=arguments, progress_callback=on_progress
+            )
+        finally:
+            # Waits still queued behind a slow client are stale once the call is done
+            for task in list(pending):
+                task.cancel()
 
         # Extract text content from result
         if result.content:
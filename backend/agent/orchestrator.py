@@ -3,10 +3,20 @@ import json
 import os
 from typing import Any, Callable, Awaitable
 
-from openai import AsyncOpenAI
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from common.rate_limit import (
+    RetryPolicy,
+    TokenBucket,
+    call_with_retry_async,
+    parse_duration,
+    retry_after_from_headers,
+    wait_event,
+)
 
 from .mcp_client import MCPManager
-from .tool_registry import mcp_tools_to_openai_tools
+from .result_encoder import encode_tool_result
+from .tool_registry import mcp_tools_to_openai_tools, validate_tool_arguments
 
 # System prompt for the agent
 SYSTEM_PROMPT = """You are a helpful AI assistant with access to three powerful tool sets:
@@ -21,14 +31,129 @@ Always be concise and helpful. If a tool call fails, explain the error and try a
 
 EventCallback = Callable[[dict[str, Any]], Awaitable[None]]
 
+# Tool-routing iterations use the fast model; final answers and invalid tool calls
+# escalate to the strong one. Set both to the same model to disable routing.
+ROUTER_MODEL = os.getenv("OPENAI_ROUTER_MODEL", "gpt-4o-mini")
+ANSWER_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+
+# Shared by every session in this process; defaults to OpenAI's tier-1 request limit
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))
+OPENAI_LIMITER = TokenBucket("openai", rate=OPENAI_RPM / 60, capacity=max(1.0, OPENAI_RPM / 60))
+OPENAI_RETRY = RetryPolicy()
+
+
+def _int_header(headers, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _update_openai_limiter(headers):
+    """Feed OpenAI's x-ratelimit-* response headers into the limiter.
+
+    The bucket counts requests, so only the request quota adjusts its level. The
+    token (TPM) quota can't be expressed in requests; it only pauses the bucket
+    once it is exhausted.
+    """
+    OPENAI_LIMITER.update(
+        _int_header(headers, "x-ratelimit-remaining-requests"),
+        parse_duration(headers.get("x-ratelimit-reset-requests")),
+    )
+    remaining_tokens = _int_header(headers, "x-ratelimit-remaining-tokens")
+    reset_tokens = parse_duration(headers.get("x-ratelimit-reset-tokens"))
+    if remaining_tokens is not None and remaining_tokens <= 0 and reset_tokens:
+        OPENAI_LIMITER.pause(reset_tokens)
+
+
+def _openai_transient(exc: Exception) -> bool:
+    """Errors the SDK would have retried itself: timeouts, dropped connections and 5xx."""
+    # APITimeoutError is a subclass of APIConnectionError
+    return isinstance(exc, (APIConnectionError, InternalServerError))
+
+
+def _openai_retry_after(exc: Exception) -> float | None:
+    """Suggested delay for retryable OpenAI rate-limit errors, None otherwise."""
+    if not isinstance(exc, RateLimitError) or exc.code == "insufficient_quota":
+        return None
+    headers = exc.response.headers
+    return retry_after_from_headers(headers) or max(
+        parse_duration(headers.get("x-ratelimit-reset-requests")) or 0.0,
+        parse_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+    )
+
 
 class AgentOrchestrator:
-    """Implements the recursive tool-calling loop between GPT-4o and MCP servers."""
+    """Implements the recursive tool-calling loop between OpenAI models and MCP servers."""
 
-    def __init__(self, mcp_manager: MCPManager):
+    def __init__(
+        self,
+        mcp_manager: MCPManager,
+        router_model: str = ROUTER_MODEL,
+        answer_model: str = ANSWER_MODEL,
+    ):
         self.mcp = mcp_manager
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.router_model = router_model
+        self.answer_model = answer_model
+        # Retries (rate limits and transient errors) are handled by the shared limiter, not the SDK
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
         self.openai_tools = mcp_tools_to_openai_tools(mcp_manager.tools)
+        self._tool_schemas = {
+            t["function"]["name"]: t["function"]["parameters"] for t in self.openai_tools
+        }
+
+    async def _create_completion(self, on_event: EventCallback, **kwargs):
+        """Call chat.completions.create through the shared OpenAI rate limiter."""
+
+        async def create():
+            raw = await self.client.chat.completions.with_raw_response.create(**kwargs)
+            _update_openai_limiter(raw.headers)
+            return raw.parse()
+
+        async def on_wait(seconds: float, attempt: int):
+            await on_event(wait_event("openai", seconds, attempt))
+
+        return await call_with_retry_async(
+            create,
+            OPENAI_LIMITER,
+            OPENAI_RETRY,
+            _openai_retry_after,
+            on_wait,
+            is_transient=_openai_transient,
+        )
+
+    def _tool_calls_valid(self, tool_calls) -> bool:
+        """True if every call names a known tool with arguments matching its schema."""
+        for tc in tool_calls:
+            schema = self._tool_schemas.get(tc.function.name)
+            if schema is None or validate_tool_arguments(schema, tc.function.arguments):
+                return False
+        return True
+
+    async def _next_step(self, messages: list[dict], on_event: EventCallback):
+        """Get the next completion choice, routing between the fast and strong models.
+
+        The fast model is kept only when it picks valid tool calls; a final answer or
+        a malformed call is regenerated by the strong model from the same messages.
+        """
+        kwargs = {
+            "messages": messages,
+            "tools": self.openai_tools if self.openai_tools else None,
+            "tool_choice": "auto" if self.openai_tools else None,
+        }
+        if self.router_model != self.answer_model:
+            response = await self._create_completion(on_event, model=self.router_model, **kwargs)
+            choice = response.choices[0]
+            if (
+                choice.finish_reason == "tool_calls"
+                and choice.message.tool_calls
+                and self._tool_calls_valid(choice.message.tool_calls)
+            ):
+                return choice
+
+        response = await self._create_completion(on_event, model=self.answer_model, **kwargs)
+        return response.choices[0]
 
     async def run(
         self,
@@ -53,14 +178,7 @@ class AgentOrchestrator:
 
         # Recursive tool-calling loop
         while True:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                tools=self.openai_tools if self.openai_tools else None,
-                tool_choice="auto" if self.openai_tools else None,
-            )
-
-            choice = response.choices[0]
+            choice = await self._next_step(messages, on_event)
             message = choice.message
 
             # Add assistant response to messages
@@ -86,12 +204,15 @@ class AgentOrchestrator:
 
                     # Execute tool via MCP
                     try:
-                        result = await self.mcp.call_tool(tool_name, args)
+                        result = await self.mcp.call_tool(tool_name, args, on_event=on_event)
                         error = None
                     except Exception as e:
                         result = f"Error: {str(e)}"
                         error = str(e)
 
+                    # Compact record lists before they go into the prompt
+                    encoded = encode_tool_result(tool_name, result)
+
                     # Emit tool_end event
                     await on_event({
                         "type": "tool_end",
@@ -99,12 +220,15 @@ class AgentOrchestrator:
                         "call_id": tc.id,
                         "result": result[:2000],  # Truncate for sidebar display
                         "error": error,
+                        "encoding": encoded.encoding,
+                        "tokens_raw": encoded.tokens_raw,
+                        "tokens_encoded": encoded.tokens_encoded,
                     })
 
                     tool_results.append({
                         "role": "tool",
                         "tool_call_id": tc.id,
-                        "content": result,
+                        "content": encoded.content,
                     })
 
                 # Feed results back into the loop
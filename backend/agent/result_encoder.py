@@ -0,0 +1,145 @@
+"""Compact encoding of structured tool results before they are fed back to the model."""
+import json
+import math
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class EncodingConfig:
+    """How a tool's result is rendered into the prompt."""
+
+    enabled: bool = True
+    max_field_chars: int = 120  # Longer cell values are truncated with an ellipsis
+    max_rows: int = 100         # Rows beyond this are dropped and counted in the header
+
+
+DEFAULT_CONFIG = EncodingConfig()
+
+# Per-tool overrides, keyed by exposed tool name (see mcp_client.py)
+TOOL_ENCODING_OVERRIDES = {
+    "web_search": EncodingConfig(max_field_chars=400),  # Snippets carry the actual content
+    "github_read_file": EncodingConfig(enabled=False),  # Raw file text, never tabular
+    "fs_read_file": EncodingConfig(enabled=False),
+    "get_answer": EncodingConfig(enabled=False),
+}
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True)
+class EncodedResult:
+    """A tool result as sent to the model, with its estimated token savings."""
+
+    content: str
+    encoding: str        # "table" or "raw"
+    tokens_raw: int      # Estimates, see estimate_tokens()
+    tokens_encoded: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_raw - self.tokens_encoded
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text and JSON).
+
+    Runs of whitespace count once, since tokenizers merge them.
+    """
+    return math.ceil(len(" ".join(text.split())) / 4)
+
+
+def _parse_json_stream(text: str) -> list[Any] | None:
+    """Parse whitespace-separated JSON values, or return None if the text isn't JSON.
+
+    FastMCP emits one text part per list item, which MCPManager joins with newlines,
+    so a list[dict] result arrives as several concatenated JSON objects.
+    """
+    decoder = json.JSONDecoder()
+    values = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        try:
+            value, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return None
+        values.append(value)
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+    return values
+
+
+def _extract_records(text: str) -> list[dict] | None:
+    """Return the result as a homogeneous list of flat records, or None."""
+    values = _parse_json_stream(text)
+    if not values:
+        return None
+    if len(values) == 1 and isinstance(values[0], list):
+        values = values[0]
+
+    if not values or not all(isinstance(v, dict) for v in values):
+        return None
+    keys = list(values[0].keys())
+    if not keys:
+        return None
+    for record in values:
+        if list(record.keys()) != keys:
+            return None
+        if not all(isinstance(v, _SCALAR_TYPES) for v in record.values()):
+            return None
+    return values
+
+
+def _format_cell(value: Any, max_chars: int) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        text = "true" if value else "false"
+    else:
+        text = str(value)
+    text = " ".join(text.split()).replace("|", "\\|")
+    if len(text) > max_chars:
+        text = text[: max_chars - 1].rstrip() + "…"
+    return text
+
+
+def _render_table(records: list[dict], config: EncodingConfig) -> str:
+    keys = list(records[0].keys())
+    shown = records[: config.max_rows]
+    header = f"[{len(records)} rows"
+    if len(shown) < len(records):
+        header += f", first {len(shown)} shown"
+    header += "]"
+
+    lines = [header, " | ".join(keys)]
+    for record in shown:
+        lines.append(" | ".join(_format_cell(record[k], config.max_field_chars) for k in keys))
+    return "\n".join(lines)
+
+
+def encode_tool_result(tool_name: str, result: str) -> EncodedResult:
+    """Render a tool result for the prompt, using a compact table for record lists.
+
+    Falls back to the raw text when encoding is disabled for the tool, the result is
+    not a homogeneous list of flat records, or the table would not be smaller.
+    """
+    config = TOOL_ENCODING_OVERRIDES.get(tool_name, DEFAULT_CONFIG)
+    tokens_raw = estimate_tokens(result)
+    raw = EncodedResult(content=result, encoding="raw", tokens_raw=tokens_raw, tokens_encoded=tokens_raw)
+
+    if not config.enabled:
+        return raw
+    records = _extract_records(result)
+    if records is None:
+        return raw
+
+    # Measure the JSON baseline without FastMCP's indentation so savings aren't inflated
+    tokens_raw = estimate_tokens(json.dumps(records, separators=(",", ":"), ensure_ascii=False))
+    raw = EncodedResult(content=result, encoding="raw", tokens_raw=tokens_raw, tokens_encoded=tokens_raw)
+
+    table = _render_table(records, config)
+    tokens_encoded = estimate_tokens(table)
+    if tokens_encoded >= tokens_raw:
+        return raw
+    return EncodedResult(content=table, encoding="table", tokens_raw=tokens_raw, tokens_encoded=tokens_encoded)
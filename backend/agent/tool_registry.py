@@ -1,4 +1,5 @@
-"""Convert MCP tool metadata to OpenAI function-calling schema format."""
+"""Convert MCP tool metadata to OpenAI function-calling schema format and validate calls against it."""
+import json
 from typing import Any
 
 
@@ -42,3 +43,53 @@ def mcp_tools_to_openai_tools(mcp_tools: list[dict]) -> list[dict[str, Any]]:
             },
         })
     return openai_tools
+
+
+# JSON Schema primitive types → Python types produced by json.loads
+_JSON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+
+def validate_tool_arguments(parameters: dict[str, Any], arguments: str | None) -> list[str]:
+    """Check a model-produced tool call's raw arguments against its parameters schema.
+
+    Only required keys and top-level primitive types are checked, which is enough to
+    catch malformed calls before they reach an MCP server.
+
+    Args:
+        parameters: The OpenAI "parameters" schema for the tool.
+        arguments: The raw JSON arguments string from the tool call.
+
+    Returns:
+        A list of problems; empty if the arguments are valid.
+    """
+    try:
+        args = json.loads(arguments or "{}")
+    except json.JSONDecodeError as e:
+        return [f"arguments are not valid JSON: {e}"]
+    if not isinstance(args, dict):
+        return ["arguments must be a JSON object"]
+
+    errors = []
+    for key in parameters.get("required", []):
+        if key not in args:
+            errors.append(f"missing required argument '{key}'")
+
+    properties = parameters.get("properties", {})
+    for key, value in args.items():
+        expected = properties.get(key, {}).get("type")
+        if not isinstance(expected, str) or expected not in _JSON_TYPES:
+            continue
+        # bool is a subclass of int, but JSON true/false is not a number
+        if isinstance(value, bool) and expected != "boolean":
+            errors.append(f"argument '{key}' should be {expected}")
+        elif not isinstance(value, _JSON_TYPES[expected]):
+            errors.append(f"argument '{key}' should be {expected}")
+    return errors
@@ -10,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from agent.mcp_client import MCPManager
 from agent.orchestrator import AgentOrchestrator
 from app.models import ErrorMessage
+from app.transport import EventSender, negotiate_subprotocol
 
 
 # Global MCP manager instance
@@ -57,12 +58,16 @@ async def health():
 @app.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
     """WebSocket endpoint for chat with real-time tool activity streaming."""
-    await websocket.accept()
+    subprotocol = negotiate_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
     conversation_history: list[dict] = []
 
+    sender = EventSender(websocket, subprotocol)
+    sender.start()
+
     async def send_event(event: dict[str, Any]):
-        """Send a JSON event to the frontend."""
-        await websocket.send_text(json.dumps(event))
+        """Queue an event for the frontend (framed per the negotiated subprotocol)."""
+        await sender.send(event)
 
     try:
         while True:
@@ -100,3 +105,5 @@ async def websocket_chat(websocket: WebSocket):
             await send_event(ErrorMessage(content=f"Connection error: {str(e)}").model_dump())
         except Exception:
             pass
+    finally:
+        await sender.stop(drain_timeout=1.0)
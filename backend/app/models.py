@@ -21,6 +21,16 @@ class ToolEndEvent(BaseModel):
     call_id: str
     result: str
     error: Optional[str] = None
+    encoding: Literal["table", "raw"] = "raw"
+    tokens_raw: Optional[int] = None
+    tokens_encoded: Optional[int] = None
+
+
+class RateLimitEvent(BaseModel):
+    type: Literal["rate_limit"] = "rate_limit"
+    upstream: str
+    wait: float
+    attempt: int
 
 
 class AssistantMessage(BaseModel):
@@ -0,0 +1,165 @@
+"""Outgoing event framing for the chat WebSocket: coalescing, MessagePack and backpressure."""
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+import msgpack
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+from websockets.exceptions import ConnectionClosed
+
+from app.models import ErrorMessage
+
+logger = logging.getLogger(__name__)
+
+# Subprotocols a client can request, in our order of preference. Both send each
+# frame as an array of events; clients that request neither get the original
+# one-JSON-object-per-text-frame format.
+SUBPROTOCOL_MSGPACK = "mcp-chat.v2.msgpack"
+SUBPROTOCOL_JSON = "mcp-chat.v2.json"
+SUPPORTED_SUBPROTOCOLS = (SUBPROTOCOL_MSGPACK, SUBPROTOCOL_JSON)
+
+COALESCE_WINDOW = 0.02  # Seconds to wait for more events before sending a frame
+MAX_BATCH = 64          # Events per frame
+QUEUE_SIZE = 256        # Events buffered for a slow client
+SEND_TIMEOUT = 10.0     # Seconds the agent may block on a full queue before we drop the client
+
+# WebSocket close codes: 1011 "Internal Error", 1013 "Try Again Later"
+CLOSE_INTERNAL_ERROR = 1011
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def negotiate_subprotocol(websocket: WebSocket) -> Optional[str]:
+    """Pick the preferred supported subprotocol the client offered, if any."""
+    offered = websocket.scope.get("subprotocols", [])
+    for subprotocol in SUPPORTED_SUBPROTOCOLS:
+        if subprotocol in offered:
+            return subprotocol
+    return None
+
+
+class EventSender:
+    """Queues events for one WebSocket and writes them from a background task.
+
+    Events produced within COALESCE_WINDOW of each other share a frame in the v2
+    subprotocols. The queue is bounded: if the client can't keep up for
+    SEND_TIMEOUT seconds, the connection is closed instead of stalling the agent.
+    """
+
+    def __init__(self, websocket: WebSocket, subprotocol: Optional[str]):
+        self.websocket = websocket
+        self.subprotocol = subprotocol
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self, drain_timeout: float = 0.0):
+        """Stop the writer task, first giving it up to `drain_timeout` seconds to flush the queue."""
+        if drain_timeout and not self._closed:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._closed = True
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def send(self, event: dict[str, Any]):
+        """Queue an event, waiting at most SEND_TIMEOUT for room in the queue."""
+        if self._closed:
+            raise WebSocketDisconnect(CLOSE_TRY_AGAIN_LATER)
+        try:
+            await asyncio.wait_for(self._queue.put(event), SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self.stop()  # Nothing will drain a queue that's been full this long
+            try:
+                await self.websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Client too slow")
+            except Exception:
+                pass
+            raise WebSocketDisconnect(CLOSE_TRY_AGAIN_LATER)
+
+    async def _next_batch(self) -> list[dict[str, Any]]:
+        """Wait for one event, then collect whatever follows within the coalescing window."""
+        batch = [await self._queue.get()]
+        if self.subprotocol is None:
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + COALESCE_WINDOW
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _encode(self, batch: list[dict[str, Any]]) -> list[str | bytes]:
+        """Serialize a batch into the frames for the negotiated subprotocol."""
+        if self.subprotocol == SUBPROTOCOL_MSGPACK:
+            return [msgpack.packb(batch, use_bin_type=True)]
+        if self.subprotocol == SUBPROTOCOL_JSON:
+            return [json.dumps(batch)]
+        return [json.dumps(event) for event in batch]
+
+    def _encode_safely(self, batch: list[dict[str, Any]]) -> list[str | bytes]:
+        """Like _encode(), but replaces events that can't be serialized with an error event.
+
+        One bad event shouldn't drop the connection or the rest of its batch.
+        """
+        try:
+            return self._encode(batch)
+        except (TypeError, ValueError):
+            pass
+        events = []
+        for event in batch:
+            try:
+                self._encode([event])
+                events.append(event)
+            except (TypeError, ValueError) as e:
+                logger.exception("Failed to serialize %s chat event", event.get("type"))
+                events.append(ErrorMessage(content=f"Failed to encode event: {e}").model_dump())
+        return self._encode(events)
+
+    def _is_disconnect(self, exc: Exception) -> bool:
+        """True if `exc` means the client is gone rather than a bug on our side."""
+        if isinstance(exc, (WebSocketDisconnect, ConnectionClosed, OSError)):
+            return True
+        # Starlette raises RuntimeError when sending on a socket that's already closed
+        return isinstance(exc, RuntimeError) and (
+            self.websocket.client_state == WebSocketState.DISCONNECTED
+            or self.websocket.application_state == WebSocketState.DISCONNECTED
+        )
+
+    async def _write_loop(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                for frame in self._encode_safely(batch):
+                    if isinstance(frame, bytes):
+                        await self.websocket.send_bytes(frame)
+                    else:
+                        await self.websocket.send_text(frame)
+            except Exception as e:
+                # Make further send() calls fail fast either way
+                self._closed = True
+                if not self._is_disconnect(e):
+                    logger.exception("Chat event writer failed")
+                    try:
+                        await self.websocket.close(code=CLOSE_INTERNAL_ERROR)
+                    except Exception:
+                        pass
+                return
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -0,0 +1,249 @@
+"""Token-bucket rate limiting and jittered retry shared by all upstream API calls.
+
+Used by the agent (OpenAI) and by the MCP servers (GitHub, Tavily). Each upstream
+gets one module-level bucket, so every chat session served by the process draws
+from the same quota.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Returns a suggested delay in seconds (0.0 if unknown) for rate-limit errors,
+# or None for errors that should not be retried.
+RetryAfterFn = Callable[[Exception], Optional[float]]
+
+# True for transient failures (timeouts, dropped connections, 5xx) that should be
+# retried with backoff but say nothing about the shared quota.
+TransientFn = Callable[[Exception], bool]
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when honouring an upstream's rate limit would exceed the retry budget."""
+
+    def __init__(self, upstream: str, wait: float, budget: float):
+        super().__init__(
+            f"{upstream} rate limit: next request allowed in {wait:.0f}s, "
+            f"which exceeds the {budget:.0f}s retry budget"
+        )
+        self.upstream = upstream
+        self.wait = wait
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be corrected by provider rate-limit headers."""
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        """
+        Args:
+            name: Upstream name, used in errors and wait notifications.
+            rate: Tokens (requests) added per second.
+            capacity: Maximum burst size.
+        """
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def refund(self):
+        """Return a token taken by reserve() that won't be used."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def pause(self, seconds: float):
+        """Hold back all callers for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update(self, remaining: Optional[int], reset_after: Optional[float]):
+        """Sync the bucket with the provider's view of the remaining quota.
+
+        Args:
+            remaining: Requests left in the current window, if reported.
+            reset_after: Seconds until the window resets, if reported.
+        """
+        if remaining is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+        if remaining <= 0 and reset_after:
+            self.pause(reset_after)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and total wait time."""
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    budget: float = 90.0  # Total seconds a single call may spend waiting, limiter waits included
+
+    def backoff(self, attempt: int, retry_after: float = 0.0) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        if retry_after > 0:
+            # Honour the provider's hint, spreading concurrent callers a little past it
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse durations like '20ms', '1.5s' or '6m0s' (OpenAI reset headers) or plain seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(n) * scale[unit] for n, unit in parts)
+
+
+def retry_after_from_headers(headers: Optional[Mapping[str, Any]]) -> float:
+    """Read 'retry-after-ms' / 'retry-after' from response headers (0.0 if absent)."""
+    if not headers:
+        return 0.0
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    if "retry-after-ms" in lowered:
+        try:
+            return float(lowered["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    return parse_duration(lowered.get("retry-after")) or 0.0
+
+
+def wait_event(upstream: str, seconds: float, attempt: int) -> dict[str, Any]:
+    """The `rate_limit` event streamed to the frontend when a call has to wait."""
+    return {
+        "type": "rate_limit",
+        "upstream": upstream,
+        "wait": round(seconds, 2),
+        "attempt": attempt,
+    }
+
+
+def parse_wait_event(message: Optional[str]) -> Optional[dict[str, Any]]:
+    """Recover a wait_event() sent as an MCP progress message, or None for other messages."""
+    try:
+        event = json.loads(message or "")
+    except ValueError:
+        return None
+    if isinstance(event, dict) and event.get("type") == "rate_limit":
+        return event
+    return None
+
+
+def mcp_wait_notifier(ctx, upstream: str) -> Callable[[float, int], Awaitable[None]]:
+    """on_wait callback for MCP tools: reports the wait as a progress notification.
+
+    Progress notifications carry the caller's progress token, so the client can
+    route each wait to the tool call that is waiting.
+
+    Args:
+        ctx: The FastMCP Context of the tool call.
+        upstream: Name reported in the event.
+    """
+    notices = 0
+
+    async def on_wait(seconds: float, attempt: int):
+        nonlocal notices
+        notices += 1  # Progress must increase with every notification
+        await ctx.report_progress(
+            notices, message=json.dumps(wait_event(upstream, seconds, attempt))
+        )
+
+    return on_wait
+
+
+def _reserve(bucket: TokenBucket, policy: RetryPolicy, waited: float) -> float:
+    """Take a token, failing fast if the wait for it would exceed the remaining budget."""
+    wait = bucket.reserve()
+    if waited + wait > policy.budget:
+        bucket.refund()
+        raise RateLimitExceeded(bucket.name, wait, policy.budget)
+    return wait
+
+
+def _next_delay(policy: RetryPolicy, attempt: int, retry_after: float, waited: float, exc: Exception) -> float:
+    """Delay before the next attempt, re-raising `exc` once attempts or budget run out."""
+    delay = policy.backoff(attempt, retry_after)
+    if attempt >= policy.max_attempts or waited + delay > policy.budget:
+        raise exc
+    return delay
+
+
+async def call_with_retry_async(
+    fn: Callable[[], Awaitable[T]],
+    bucket: TokenBucket,
+    policy: RetryPolicy,
+    retry_after_for: RetryAfterFn,
+    on_wait: Optional[Callable[[float, int], Awaitable[None]]] = None,
+    is_transient: Optional[TransientFn] = None,
+) -> T:
+    """Call `fn` through the bucket, retrying rate-limit and transient errors with backoff.
+
+    Raises RateLimitExceeded instead of waiting when the limiter (for example, a
+    quota paused until its reset) would push the call past the retry budget.
+
+    Args:
+        fn: The upstream call.
+        bucket: Limiter for the upstream.
+        policy: Retry limits.
+        retry_after_for: Classifies exceptions raised by `fn` (see RetryAfterFn).
+        on_wait: Awaited with (seconds, attempt) before the call waits on the
+            limiter; attempt is 0 before the first try and counts retries after that.
+        is_transient: Classifies other exceptions as retryable (see TransientFn).
+            These back off only this call, without pausing the shared bucket.
+    """
+    waited = 0.0
+    attempt = 0
+    while True:
+        wait = _reserve(bucket, policy, waited)
+        if wait > 0:
+            if on_wait:
+                await on_wait(wait, attempt)
+            await asyncio.sleep(wait)
+            waited += wait
+        try:
+            return await fn()
+        except Exception as e:
+            retry_after = retry_after_for(e)
+            if retry_after is None:
+                if not (is_transient and is_transient(e)):
+                    raise
+                attempt += 1
+                delay = _next_delay(policy, attempt, 0.0, waited, e)
+                await asyncio.sleep(delay)
+                waited += delay
+                continue
+            attempt += 1
+            delay = _next_delay(policy, attempt, retry_after, waited, e)
+            # Pausing the shared bucket makes every caller back off, not just this one;
+            # the wait itself is taken (and counted) by the next reserve
+            bucket.pause(delay)
@@ -1,26 +1,102 @@
 """MCP Server #1: GitHub — list_repos, read_file, create_issue."""
+import asyncio
 import os
+import sys
+import time
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Callable, TypeVar
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
-from mcp.server.fastmcp import FastMCP
-from github import Github, GithubException
+# Servers run as scripts; make the backend's shared modules (common/) importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.server.fastmcp import Context, FastMCP
+from github import Github, GithubException, RateLimitExceededException
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+from common.rate_limit import (
+    RetryPolicy,
+    TokenBucket,
+    call_with_retry_async,
+    mcp_wait_notifier,
+    retry_after_from_headers,
+)
 
 mcp = FastMCP("github")
 
+T = TypeVar("T")
+
+# Authenticated REST quota is 5000 requests/hour; shared by every session using this server
+GITHUB_LIMITER = TokenBucket("github", rate=float(os.getenv("GITHUB_RPH", "5000")) / 3600, capacity=10)
+GITHUB_RETRY = RetryPolicy(base_delay=2.0, max_delay=60.0)
+SECONDARY_LIMIT_WAIT = 60.0
+
 
 def _get_client() -> Github:
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         raise RuntimeError("GITHUB_TOKEN environment variable not set")
-    return Github(token)
+    # Retries (rate limits and transient errors) are handled by the shared limiter, not PyGithub
+    return Github(token, retry=None)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Suggested delay for primary/secondary GitHub rate limits, None otherwise."""
+    if not isinstance(exc, GithubException) or exc.status not in (403, 429):
+        return None
+    headers = exc.headers or {}
+    data = exc.data if isinstance(exc.data, dict) else {}
+    message = str(data.get("message", "")).lower()
+    if not isinstance(exc, RateLimitExceededException) and "rate limit" not in message:
+        return None  # Plain permission error
+    retry_after = retry_after_from_headers(headers)
+    if retry_after:
+        return retry_after
+    lowered = {k.lower(): v for k, v in headers.items()}
+    # x-ratelimit-reset is on every response; it only applies once the primary quota is spent
+    if lowered.get("x-ratelimit-remaining") == "0" and lowered.get("x-ratelimit-reset"):
+        return max(0.0, float(lowered["x-ratelimit-reset"]) - time.time())
+    # Secondary limit without a hint: GitHub asks clients to wait at least a minute
+    return SECONDARY_LIMIT_WAIT
+
+
+def _transient(exc: Exception) -> bool:
+    """GitHub 5xx responses, timeouts and dropped connections are worth retrying."""
+    if isinstance(exc, GithubException):
+        return exc.status is not None and exc.status >= 500
+    return isinstance(exc, (RequestsConnectionError, Timeout))
+
+
+async def _call_github(fn: Callable[[Github], T], ctx: Context) -> T:
+    """Run `fn` with a fresh client through the shared limiter, retrying rate limits.
+
+    The blocking PyGithub calls run in a worker thread, so a tool waiting on the
+    limiter doesn't hold up other requests to this server. Waits are reported to
+    the client as MCP progress notifications.
+    """
+
+    def attempt() -> T:
+        g = _get_client()
+        result = fn(g)
+        remaining, _ = g.rate_limiting
+        GITHUB_LIMITER.update(remaining, g.rate_limiting_resettime - time.time())
+        return result
+
+    return await call_with_retry_async(
+        lambda: asyncio.to_thread(attempt),
+        GITHUB_LIMITER,
+        GITHUB_RETRY,
+        _retry_after,
+        mcp_wait_notifier(ctx, "github"),
+        is_transient=_transient,
+    )
 
 
 @mcp.tool()
-def list_repos(username: str) -> list[dict]:
+async def list_repos(username: str, ctx: Context) -> list[dict]:
     """List public repositories for a GitHub user.
 
     Args:
@@ -29,8 +105,7 @@ def list_repos(username: str) -> list[dict]:
     Returns:
         List of dicts with name, description, stars, language, url.
     """
-    g = _get_client()
-    try:
+    def fetch(g: Github) -> list[dict]:
         user = g.get_user(username)
         repos = []
         for repo in user.get_repos():
@@ -42,12 +117,15 @@ def list_repos(username: str) -> list[dict]:
                 "url": repo.html_url,
             })
         return sorted(repos, key=lambda r: r["stars"], reverse=True)
+
+    try:
+        return await _call_github(fetch, ctx)
     except GithubException as e:
         raise RuntimeError(f"GitHub API error: {e.data.get('message', str(e))}")
 
 
 @mcp.tool()
-def read_file(repo_full_name: str, file_path: str, branch: str = "main") -> str:
+async def read_file(repo_full_name: str, file_path: str, ctx: Context, branch: str = "main") -> str:
     """Read the content of a file from a GitHub repository.
 
     Args:
@@ -58,29 +136,27 @@ def read_file(repo_full_name: str, file_path: str, branch: str = "main") -> str:
     Returns:
         File content as a string.
     """
-    g = _get_client()
-    try:
+    def fetch(g: Github, ref: str) -> str:
         repo = g.get_repo(repo_full_name)
-        contents = repo.get_contents(file_path, ref=branch)
+        contents = repo.get_contents(file_path, ref=ref)
         if isinstance(contents, list):
             raise RuntimeError(f"'{file_path}' is a directory, not a file")
         return contents.decoded_content.decode("utf-8")
+
+    try:
+        return await _call_github(lambda g: fetch(g, branch), ctx)
     except GithubException as e:
-        # Try master branch if main fails
-        if branch == "main":
+        # Try master branch if main fails (but not when we're out of quota)
+        if branch == "main" and _retry_after(e) is None:
             try:
-                repo = g.get_repo(repo_full_name)
-                contents = repo.get_contents(file_path, ref="master")
-                if isinstance(contents, list):
-                    raise RuntimeError(f"'{file_path}' is a directory, not a file")
-                return contents.decoded_content.decode("utf-8")
+                return await _call_github(lambda g: fetch(g, "master"), ctx)
             except GithubException:
                 pass
         raise RuntimeError(f"GitHub API error: {e.data.get('message', str(e))}")
 
 
 @mcp.tool()
-def create_issue(repo_full_name: str, title: str, body: str = "") -> dict:
+async def create_issue(repo_full_name: str, title: str, ctx: Context, body: str = "") -> dict:
     """Create a new issue in a GitHub repository.
 
     Args:
@@ -91,8 +167,7 @@ def create_issue(repo_full_name: str, title: str, body: str = "") -> dict:
     Returns:
         Dict with issue number, title, url.
     """
-    g = _get_client()
-    try:
+    def create(g: Github) -> dict:
         repo = g.get_repo(repo_full_name)
         issue = repo.create_issue(title=title, body=body)
         return {
@@ -101,6 +176,9 @@ def create_issue(repo_full_name: str, title: str, body: str = "") -> dict:
             "url": issue.html_url,
             "state": issue.state,
         }
+
+    try:
+        return await _call_github(create, ctx)
     except GithubException as e:
         raise RuntimeError(f"GitHub API error: {e.data.get('message', str(e))}")
 
@@ -1,16 +1,29 @@
 """MCP Server #2: Web Search — web_search, get_answer (via Tavily)."""
+import asyncio
 import os
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
-from mcp.server.fastmcp import FastMCP
+# Servers run as scripts; make the backend's shared modules (common/) importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp.server.fastmcp import Context, FastMCP
 from tavily import TavilyClient
+from tavily.errors import UsageLimitExceededError
+
+from common.rate_limit import RetryPolicy, TokenBucket, call_with_retry_async, mcp_wait_notifier
 
 mcp = FastMCP("web_search")
 
+# Tavily doesn't expose rate-limit headers, so the bucket runs at the configured rate only
+TAVILY_RPM = float(os.getenv("TAVILY_RPM", "100"))
+TAVILY_LIMITER = TokenBucket("tavily", rate=TAVILY_RPM / 60, capacity=5)
+TAVILY_RETRY = RetryPolicy()
+
 
 def _get_client() -> TavilyClient:
     api_key = os.getenv("TAVILY_API_KEY")
@@ -19,8 +32,29 @@ def _get_client() -> TavilyClient:
     return TavilyClient(api_key=api_key)
 
 
+def _retry_after(exc: Exception) -> float | None:
+    """Tavily signals rate limiting with HTTP 429 (UsageLimitExceededError) and no hint."""
+    return 0.0 if isinstance(exc, UsageLimitExceededError) else None
+
+
+async def _search(ctx: Context, **kwargs) -> dict:
+    """Run a Tavily search through the shared limiter, retrying rate limits.
+
+    The blocking client call runs in a worker thread; waits are reported to the
+    client as MCP progress notifications.
+    """
+    client = _get_client()
+    return await call_with_retry_async(
+        lambda: asyncio.to_thread(client.search, **kwargs),
+        TAVILY_LIMITER,
+        TAVILY_RETRY,
+        _retry_after,
+        mcp_wait_notifier(ctx, "tavily"),
+    )
+
+
 @mcp.tool()
-def web_search(query: str, max_results: int = 5) -> list[dict]:
+async def web_search(query: str, ctx: Context, max_results: int = 5) -> list[dict]:
     """Search the web for a query and return relevant results.
 
     Args:
@@ -30,8 +64,8 @@ def web_search(query: str, max_results: int = 5) -> list[dict]:
     Returns:
         List of dicts with title, url, content snippet, score.
     """
-    client = _get_client()
-    response = client.search(
+    response = await _search(
+        ctx,
         query=query,
         max_results=max_results,
         include_answer=False,
@@ -48,7 +82,7 @@ def web_search(query: str, max_results: int = 5) -> list[dict]:
 
 
 @mcp.tool()
-def get_answer(query: str) -> str:
+async def get_answer(query: str, ctx: Context) -> str:
     """Get a direct AI-generated answer to a question using web search context.
 
     Args:
@@ -57,8 +91,8 @@ def get_answer(query: str) -> str:
     Returns:
         A concise answer string synthesized from web search results.
     """
-    client = _get_client()
-    response = client.search(
+    response = await _search(
+        ctx,
         query=query,
         max_results=5,
         include_answer=True,
@@ -4,7 +4,7 @@ import ToolSidebar from './components/ToolSidebar.jsx'
 import './App.css'
 
 export default function App() {
-  const { messages, toolEvents, status, sendMessage, isLoading } = useWebSocket()
+  const { messages, toolEvents, status, sendMessage, isLoading, rateLimit } = useWebSocket()
 
   return (
     <div className="app">
@@ -25,6 +25,7 @@ export default function App() {
             messages={messages}
             onSend={sendMessage}
             isLoading={isLoading}
+            rateLimit={rateLimit}
             disabled={status !== 'connected'}
           />
         </section>
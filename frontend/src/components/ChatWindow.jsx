@@ -2,7 +2,7 @@ import { useState, useRef, useEffect } from 'react'
 import ChatMessage from './ChatMessage.jsx'
 import '../styles/ChatWindow.css'
 
-export default function ChatWindow({ messages, onSend, isLoading, disabled }) {
+export default function ChatWindow({ messages, onSend, isLoading, rateLimit, disabled }) {
   const [input, setInput] = useState('')
   const bottomRef = useRef(null)
   const inputRef = useRef(null)
@@ -60,7 +60,11 @@ export default function ChatWindow({ messages, onSend, isLoading, disabled }) {
             <div className="loading-dots">
               <span /><span /><span />
             </div>
-            <span className="loading-text">Agent is thinking…</span>
+            <span className="loading-text">
+              {rateLimit
+                ? `Rate limited by ${rateLimit.upstream}, waiting ${rateLimit.wait}s…`
+                : 'Agent is thinking…'}
+            </span>
           </div>
         )}
 
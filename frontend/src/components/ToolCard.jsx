@@ -58,7 +58,10 @@ export default function ToolCard({ event }) {
 
       {expanded && event.result && (
         <div className="tool-result">
-          <div className="tool-result-label">Result</div>
+          <div className="tool-result-label">
+            Result
+            {event.encoding === 'table' && ` · compacted ~${event.tokens_raw} → ~${event.tokens_encoded} tokens (est.)`}
+          </div>
           <pre className="tool-result-content">{event.result}</pre>
         </div>
       )}
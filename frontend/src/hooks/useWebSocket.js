@@ -1,20 +1,28 @@
 import { useState, useEffect, useRef, useCallback } from 'react'
+import { decodeMsgpack } from '../utils/msgpack.js'
 
 const WS_URL = `${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/ws/chat`
 
+// Preferred first. Both v2 subprotocols deliver an array of coalesced events per
+// frame; the server falls back to one JSON event per frame if neither is accepted.
+const SUBPROTOCOLS = ['mcp-chat.v2.msgpack', 'mcp-chat.v2.json']
+
 export function useWebSocket() {
   const [messages, setMessages] = useState([])
   const [toolEvents, setToolEvents] = useState([])
   const [status, setStatus] = useState('disconnected')
   const [isLoading, setIsLoading] = useState(false)
+  const [rateLimit, setRateLimit] = useState(null)
   const wsRef = useRef(null)
   const reconnectTimeout = useRef(null)
+  const rateLimitTimeout = useRef(null)
 
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return
 
     setStatus('connecting')
-    const ws = new WebSocket(WS_URL)
+    const ws = new WebSocket(WS_URL, SUBPROTOCOLS)
+    ws.binaryType = 'arraybuffer'
     wsRef.current = ws
 
     ws.onopen = () => {
@@ -34,8 +42,11 @@ export function useWebSocket() {
 
     ws.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data)
-        handleEvent(data)
+        const data = event.data instanceof ArrayBuffer
+          ? decodeMsgpack(event.data)
+          : JSON.parse(event.data)
+        const events = Array.isArray(data) ? data : [data]
+        events.forEach(handleEvent)
       } catch (e) {
         console.error('Failed to parse WS message:', e)
       }
@@ -43,6 +54,10 @@ export function useWebSocket() {
   }, [])
 
   const handleEvent = useCallback((event) => {
+    // A rate-limit notice lasts until its wait is over or anything else happens
+    clearTimeout(rateLimitTimeout.current)
+    if (event.type !== 'rate_limit') setRateLimit(null)
+
     switch (event.type) {
       case 'tool_start':
         setToolEvents(prev => [{
@@ -60,6 +75,11 @@ export function useWebSocket() {
         ))
         break
 
+      case 'rate_limit':
+        setRateLimit({ upstream: event.upstream, wait: event.wait, attempt: event.attempt })
+        rateLimitTimeout.current = setTimeout(() => setRateLimit(null), event.wait * 1000)
+        break
+
       case 'assistant_message':
         setMessages(prev => [...prev, {
           role: 'assistant',
@@ -87,6 +107,7 @@ export function useWebSocket() {
     connect()
     return () => {
       clearTimeout(reconnectTimeout.current)
+      clearTimeout(rateLimitTimeout.current)
       wsRef.current?.close()
     }
   }, [connect])
@@ -104,5 +125,5 @@ export function useWebSocket() {
     wsRef.current.send(JSON.stringify({ type: 'user_message', content }))
   }, [])
 
-  return { messages, toolEvents, status, sendMessage, isLoading }
+  return { messages, toolEvents, status, sendMessage, isLoading, rateLimit }
 }
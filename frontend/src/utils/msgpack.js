@@ -0,0 +1,82 @@
+// Minimal MessagePack decoder for chat events (maps, arrays, strings, numbers,
+// booleans, nil, bin). Extension types are not used by the backend.
+
+const textDecoder = new TextDecoder()
+
+export function decodeMsgpack(buffer) {
+  const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer)
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  let pos = 0
+
+  const readStr = (length) => {
+    const str = textDecoder.decode(bytes.subarray(pos, pos + length))
+    pos += length
+    return str
+  }
+
+  const readBin = (length) => {
+    const bin = bytes.slice(pos, pos + length)
+    pos += length
+    return bin
+  }
+
+  const readArray = (length) => {
+    const arr = new Array(length)
+    for (let i = 0; i < length; i++) arr[i] = read()
+    return arr
+  }
+
+  const readMap = (length) => {
+    const obj = {}
+    for (let i = 0; i < length; i++) {
+      const key = read()
+      obj[key] = read()
+    }
+    return obj
+  }
+
+  const u8 = () => view.getUint8(pos++)
+  const u16 = () => { const v = view.getUint16(pos); pos += 2; return v }
+  const u32 = () => { const v = view.getUint32(pos); pos += 4; return v }
+
+  function read() {
+    const type = u8()
+
+    if (type <= 0x7f) return type
+    if (type >= 0xe0) return type - 0x100
+    if ((type & 0xf0) === 0x80) return readMap(type & 0x0f)
+    if ((type & 0xf0) === 0x90) return readArray(type & 0x0f)
+    if ((type & 0xe0) === 0xa0) return readStr(type & 0x1f)
+
+    let value
+    switch (type) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: return readBin(u8())
+      case 0xc5: return readBin(u16())
+      case 0xc6: return readBin(u32())
+      case 0xca: value = view.getFloat32(pos); pos += 4; return value
+      case 0xcb: value = view.getFloat64(pos); pos += 8; return value
+      case 0xcc: return u8()
+      case 0xcd: return u16()
+      case 0xce: return u32()
+      case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value
+      case 0xd0: value = view.getInt8(pos); pos += 1; return value
+      case 0xd1: value = view.getInt16(pos); pos += 2; return value
+      case 0xd2: value = view.getInt32(pos); pos += 4; return value
+      case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value
+      case 0xd9: return readStr(u8())
+      case 0xda: return readStr(u16())
+      case 0xdb: return readStr(u32())
+      case 0xdc: return readArray(u16())
+      case 0xdd: return readArray(u32())
+      case 0xde: return readMap(u16())
+      case 0xdf: return readMap(u32())
+      default:
+        throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`)
+    }
+  }
+
+  return read()
+}